@@ -1,7 +1,17 @@
+import heapq
+import itertools
+import logging
+import logging.handlers
+import multiprocessing
+import queue
 import random
+import struct
+import sys
 import time
 import threading
-from enum import Enum
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 # Configuration Parameters
 PROB_CORRUPTION = 0.1
@@ -9,32 +19,148 @@ PROB_LOSS = 0.1
 PROB_DELAY = 0.1
 MAX_DELAY = 0.5
 
-TIMEOUT_DURATION = 1.0
+TIMEOUT_DURATION = 1.0  # initial RTO, before any RTT has been measured
+MIN_TIMEOUT = 0.05
+MAX_TIMEOUT = 60.0
 WINDOW_SIZE = 4
 TOTAL_PACKETS = 10
+SIMULATION_TIMEOUT = 10.0  # longest a protocol run may take before its partial result is reported
+NS_PER_SEC = 1_000_000_000
+
+LOG = logging.getLogger("rdt")
+
+# Shared Timer Scheduler (deadlines are time.monotonic_ns() integers)
+class TimerWheel:
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, deadline, callback, args=()):
+        # Heap entries are [deadline, tiebreak, callback, args]; the list itself is the handle.
+        entry = [deadline, next(self._counter), callback, args]
+        with self._cond:
+            heapq.heappush(self._heap, entry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="TimerWheel", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return entry
+
+    def cancel(self, handle):
+        # Lazy tombstone: the worker discards the entry when it reaches the top of the heap.
+        if handle is not None:
+            handle[2] = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and self._heap[0][2] is None:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.monotonic_ns()
+                    if remaining <= 0:
+                        entry = heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(timeout=remaining / NS_PER_SEC)
+            callback = entry[2]
+            if callback is None:
+                continue
+            try:
+                callback(*entry[3])
+            except Exception:
+                # A failing callback must not take the shared worker (and every other timer) down with it.
+                LOG.exception("[TimerWheel] Timer callback failed")
+
+wheel = TimerWheel()
+
+# Per-protocol event queue: packets and timeouts are handled one at a time on a single thread
+class RxQueue:
+    def __init__(self, name):
+        self._queue = queue.SimpleQueue()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
 
-# Packet Type Enum
-class PacketType(Enum):
-    DATA = 1
-    ACK = 2
+    def start(self):
+        self._thread.start()
+
+    def post(self, handler, *args):
+        if not self._stopped:
+            self._queue.put((handler, args))
+
+    # Ends the thread once the events already posted have been handled; later posts are dropped
+    def stop(self):
+        self._stopped = True
+        self._queue.put((None, ()))
+
+    def _run(self):
+        while True:
+            handler, args = self._queue.get()
+            if handler is None:
+                break
+            try:
+                handler(*args)
+            except Exception:
+                LOG.exception("[RxQueue] Handler failed")
+
+# RFC 6298 Retransmission Timeout Estimator (integer nanoseconds; alpha = 1/8, beta = 1/4)
+class RttEstimator:
+    def __init__(self, initial_rto=TIMEOUT_DURATION, min_rto=MIN_TIMEOUT, max_rto=MAX_TIMEOUT):
+        self.initial_rto = int(initial_rto * NS_PER_SEC)
+        self.min_rto = int(min_rto * NS_PER_SEC)
+        self.max_rto = int(max_rto * NS_PER_SEC)
+        self.srtt = None
+        self.rttvar = None
+
+    def sample(self, rtt):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt // 2
+        else:
+            self.rttvar += (abs(self.srtt - rtt) - self.rttvar) // 4
+            self.srtt += (rtt - self.srtt) // 8
+
+    # retries: consecutive timeouts of the packet the timer is being armed for
+    def rto(self, retries=0):
+        rto = self.initial_rto if self.srtt is None else self.srtt + 4 * self.rttvar
+        rto = max(self.min_rto, rto)
+        # The first two retries keep the measured RTO; each one after that doubles it.
+        if retries > 2:
+            rto = min(self.max_rto, rto << (retries - 2))
+        return rto
+
+# Packet Types (plain ints: they index each protocol's dispatch tuple)
+DATA, ACK = 0, 1
+PACKET_TYPE_NAMES = ("DATA", "ACK")
 
 # Packet Structure
 class Packet:
-    def __init__(self, sequence_number, payload=None, packet_type=PacketType.DATA):
+    # Fixed attribute set: no per-packet __dict__
+    __slots__ = ("seq", "payload", "type", "checksum", "_orig_checksum")
+
+    # Signed seq: corrupt-ACK paths can produce negative sequence numbers.
+    _HEADER = struct.Struct("<iB")
+
+    def __init__(self, sequence_number, payload=None, packet_type=DATA):
         self.seq = sequence_number
         self.payload = payload
         self.type = packet_type
-        self.checksum = self._compute_checksum()
-
-    def _compute_checksum(self):
-        data = f"{self.seq}{self.payload}{self.type}".encode()
-        return sum(data) % 256
+        raw = self._HEADER.pack(sequence_number, packet_type)
+        if isinstance(payload, str):
+            raw += payload.encode()
+        # Fields never change after construction, so the checksum is computed once;
+        # the channel corrupts a packet by altering self.checksum.
+        self._orig_checksum = self.checksum = zlib.crc32(raw) & 0xFF
 
     def is_corrupt(self):
-        return self.checksum != self._compute_checksum()
+        return self.checksum != self._orig_checksum
 
     def __str__(self):
-        return f"<Packet type={self.type.name}, seq={self.seq}, checksum={self.checksum}, payload={self.payload}>"
+        return f"<Packet type={PACKET_TYPE_NAMES[self.type]}, seq={self.seq}, checksum={self.checksum}, payload={self.payload}>"
 
 # Simulated Unreliable Channel
 class UnreliableChannel:
@@ -45,18 +171,30 @@ class UnreliableChannel:
         self.max_delay = max_delay
 
     def transmit(self, packet, receiver_callback):
-        if random.random() < self.loss:
-            print(f"[CHANNEL] DROPPED {packet}")
+        rand = random.random
+        self._deliver(packet, receiver_callback, rand(), rand(), rand())
+
+    # Send a whole window in one call (3 random draws per packet)
+    def transmit_many(self, packets, receiver_callback):
+        rand = random.random
+        deliver = self._deliver
+        for packet in packets:
+            deliver(packet, receiver_callback, rand(), rand(), rand())
+
+    def _deliver(self, packet, receiver_callback, r_loss, r_corrupt, r_delay):
+        if r_loss < self.loss:
+            LOG.debug("[CHANNEL] DROPPED %s", packet)
             return
 
-        if random.random() < self.corruption:
-            print(f"[CHANNEL] CORRUPTED {packet}")
+        if r_corrupt < self.corruption:
+            LOG.debug("[CHANNEL] CORRUPTED %s", packet)
             packet.checksum = (packet.checksum + 1) % 256
 
-        if random.random() < self.delay:
-            delay_time = random.uniform(0, self.max_delay)
-            print(f"[CHANNEL] DELAYING {packet} by {delay_time:.2f} sec")
-            threading.Timer(delay_time, lambda: receiver_callback(packet)).start()
+        if r_delay < self.delay:
+            # Given r_delay < delay, r_delay / delay is uniform on [0, 1).
+            delay_time = r_delay / self.delay * self.max_delay
+            LOG.debug("[CHANNEL] DELAYING %s by %.2f sec", packet, delay_time)
+            wheel.schedule(time.monotonic_ns() + int(delay_time * NS_PER_SEC), receiver_callback, (packet,))
         else:
             receiver_callback(packet)
 
@@ -65,285 +203,421 @@ class StopAndWaitRDT:
     def __init__(self, channel, total=TOTAL_PACKETS, timeout=TIMEOUT_DURATION):
         self.channel = channel
         self.total_packets = total
-        self.timeout = timeout
         self.seq_num = 0
         self.timer = None
-        self.buffer = {}
+        self.buffer = [None] * total
         self.sent_count = 0
         self.received_count = 0
         self.pending_packet = None
+        self.sent_at = None
+        self.retries = 0
+        # A 1-bit seq cannot tell a stale copy from new data, so never retransmit while an earlier copy
+        # or its ACK may still be in flight: floor the RTO at the channel's worst-case round trip.
+        self.rtt = RttEstimator(timeout, min_rto=2 * channel.max_delay + MIN_TIMEOUT)
+        self._rx_queue = RxQueue(type(self).__name__)
+        self._done = threading.Event()
+        self._dispatch = (self._receiver, self._ack_handler)  # indexed by packet type
         self.running = False
 
     def _start_timer(self):
-        self.timer = threading.Timer(self.timeout, self._on_timeout)
-        self.timer.start()
+        self._stop_timer()
+        packet = self.pending_packet
+        self.timer = wheel.schedule(time.monotonic_ns() + self.rtt.rto(self.retries), self._rx_queue.post, (self._on_timeout, packet))
 
     def _stop_timer(self):
         if self.timer:
-            self.timer.cancel()
+            wheel.cancel(self.timer)
             self.timer = None
 
-    def _on_timeout(self):
-        print(f"[Sender] TIMEOUT on packet {self.pending_packet.seq}. Retransmitting...")
-        self.channel.transmit(self.pending_packet, self.receive)
+    def _on_timeout(self, packet):
+        if packet is not self.pending_packet or self.timer is None:
+            return  # packet was ACKed while this timeout was queued
+        LOG.debug("[Sender] TIMEOUT on packet %s. Retransmitting...", packet.seq)
+        self.retries += 1
+        self.sent_at = None  # Karn: never sample RTT from a retransmitted packet
+        # Fresh copy: the channel may have corrupted the checksum of the original in flight.
+        self.channel.transmit(Packet(packet.seq, packet.payload), self.receive)
         self._start_timer()
 
     def send(self):
         if self.sent_count >= self.total_packets:
-            print("[Sender] All packets sent.")
+            LOG.debug("[Sender] All packets sent.")
             self.running = False
+            self._done.set()
+            self._rx_queue.stop()
             return
         packet = Packet(self.seq_num, f"DATA_{self.sent_count}")
         self.pending_packet = packet
-        print(f"[Sender] Sending {packet}")
+        self.sent_at = time.monotonic_ns()
+        LOG.debug("[Sender] Sending %s", packet)
         self.channel.transmit(packet, self.receive)
         self._start_timer()
 
+    # Channel delivery callback: may run on any thread, so just hand the packet to the event queue
     def receive(self, packet):
-        if packet.type == PacketType.DATA:
-            self._receiver(packet)
-        elif packet.type == PacketType.ACK:
-            self._ack_handler(packet)
+        self._rx_queue.post(self._dispatch[packet.type], packet)
 
     def _receiver(self, packet):
-        print(f"[Receiver] Received {packet}")
+        LOG.debug("[Receiver] Received %s", packet)
         if packet.is_corrupt():
-            print("[Receiver] Packet corrupted. Resending last ACK.")
-            ack = Packet(1 - self.seq_num, packet_type=PacketType.ACK)
+            LOG.debug("[Receiver] Packet corrupted. Resending last ACK.")
+            ack = Packet(1 - self.seq_num, packet_type=ACK)
         elif packet.seq == self.seq_num:
-            print(f"[Receiver] Accepted packet {packet.seq}")
+            LOG.debug("[Receiver] Accepted packet %s", packet.seq)
             self.buffer[self.received_count] = packet.payload
             self.received_count += 1
-            ack = Packet(packet.seq, packet_type=PacketType.ACK)
+            ack = Packet(packet.seq, packet_type=ACK)
             self.seq_num = 1 - self.seq_num
         else:
-            print("[Receiver] Duplicate packet received. Resending ACK.")
-            ack = Packet(packet.seq, packet_type=PacketType.ACK)
+            LOG.debug("[Receiver] Duplicate packet received. Resending ACK.")
+            ack = Packet(packet.seq, packet_type=ACK)
 
         self.channel.transmit(ack, self.receive)
 
     def _ack_handler(self, ack):
-        print(f"[Sender] ACK received: {ack}")
+        LOG.debug("[Sender] ACK received: %s", ack)
         if ack.is_corrupt():
-            print("[Sender] ACK is corrupt. Ignoring...")
+            LOG.debug("[Sender] ACK is corrupt. Ignoring...")
             return
         if ack.seq == self.pending_packet.seq:
             self._stop_timer()
-            print(f"[Sender] ACK verified for seq {ack.seq}. Moving on.")
+            if self.sent_at is not None:
+                self.rtt.sample(time.monotonic_ns() - self.sent_at)
+                self.sent_at = None
+            self.retries = 0
+            LOG.debug("[Sender] ACK verified for seq %s. Moving on.", ack.seq)
             self.sent_count += 1
             self.send()
 
     def start(self):
         self.running = True
-        self.send()
+        self._rx_queue.start()
+        self._rx_queue.post(self.send)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
 
     def get_data(self):
-        return [self.buffer[i] for i in sorted(self.buffer)]
+        return self.buffer[:self.received_count]
 
 # Go-Back-N Protocol
 class GoBackNRDT:
     def __init__(self, channel, total=TOTAL_PACKETS, window_size=WINDOW_SIZE, timeout=TIMEOUT_DURATION):
+        if window_size <= 0 or window_size & (window_size - 1):
+            raise ValueError(f"window_size must be a power of two, got {window_size}")
         self.channel = channel
         self.total_packets = total
         self.window_size = window_size
-        self.timeout = timeout
+        self.base = 0
         self.seq_num = 0
         self.ack_received = 0
-        self.timer = {}
-        self.buffer = {}
-        self.pending_packets = []
-        self.sent_count = 0
+        self.timer = None
+        self.buffer = [None] * total
+        # In-flight window as a ring indexed by seq & mask, seqs and payloads in parallel
+        self._mask = window_size - 1
+        self._seqs = array("i", [-1]) * window_size
+        self._payloads = [None] * window_size
+        self.retries = 0
         self.received_count = 0
+        self.sent_at = {}
+        self.rtt = RttEstimator(timeout)
+        self._rx_queue = RxQueue(type(self).__name__)
+        self._done = threading.Event()
+        self._dispatch = (self._receiver, self._ack_handler)  # indexed by packet type
         self.running = False
 
-    def _start_timer(self, seq_num):
-        self.timer[seq_num] = threading.Timer(self.timeout, self._on_timeout, [seq_num])
-        self.timer[seq_num].start()
+    # A single timer covers the oldest unacknowledged packet (self.base)
+    def _start_timer(self):
+        self._stop_timer()
+        self.timer = wheel.schedule(time.monotonic_ns() + self.rtt.rto(self.retries), self._rx_queue.post, (self._on_timeout, self.base))
 
-    def _stop_timer(self, seq_num):
-        if seq_num in self.timer:
-            self.timer[seq_num].cancel()
-            del self.timer[seq_num]
+    def _stop_timer(self):
+        if self.timer:
+            wheel.cancel(self.timer)
+            self.timer = None
 
-    def _on_timeout(self, seq_num):
-        print(f"[Sender] TIMEOUT for seq {seq_num}. Retransmitting window...")
-        for i in range(self.seq_num, min(self.seq_num + self.window_size, self.total_packets)):
-            self.channel.transmit(self.pending_packets[i % self.window_size], self.receive)
-            self._start_timer(i)
+    def _window_packet(self, seq_num):
+        idx = seq_num & self._mask
+        if self._seqs[idx] != seq_num:
+            return None
+        return Packet(seq_num, self._payloads[idx])
+
+    def _on_timeout(self, base):
+        if base != self.base or self.timer is None:
+            return  # window advanced or drained while this timeout was queued
+        LOG.debug("[Sender] TIMEOUT for seq %s. Retransmitting window...", self.base)
+        self.retries += 1
+        self._start_timer()
+        packets = []
+        for i in range(self.base, self.seq_num):
+            packet = self._window_packet(i)
+            if packet is not None:
+                self.sent_at.pop(i, None)  # Karn: never sample RTT from a retransmitted packet
+                packets.append(packet)
+        self.channel.transmit_many(packets, self.receive)
 
     def send(self):
-        if self.sent_count >= self.total_packets:
-            print("[Sender] All packets sent.")
+        if self.base >= self.total_packets:
+            LOG.debug("[Sender] All packets sent.")
             self.running = False
+            self._done.set()
+            self._rx_queue.stop()
             return
 
-        for i in range(self.window_size):
-            if self.sent_count + i < self.total_packets:
-                packet = Packet(self.seq_num + i, f"DATA_{self.sent_count + i}")
-                self.pending_packets.append(packet)
-                print(f"[Sender] Sending {packet}")
-                self.channel.transmit(packet, self.receive)
-                self._start_timer(self.seq_num + i)
-
-        self.seq_num += self.window_size
-
+        end = min(self.base + self.window_size, self.total_packets)
+        packets = [Packet(seq, f"DATA_{seq}") for seq in range(self.seq_num, end)]
+        if not packets:
+            return
+        for packet in packets:
+            idx = packet.seq & self._mask
+            self._seqs[idx] = packet.seq
+            self._payloads[idx] = packet.payload
+        self.seq_num = end
+        if self.timer is None:
+            self._start_timer()
+        for packet in packets:
+            self.sent_at[packet.seq] = time.monotonic_ns()
+            LOG.debug("[Sender] Sending %s", packet)
+        self.channel.transmit_many(packets, self.receive)
+
+    # Channel delivery callback: may run on any thread, so just hand the packet to the event queue
     def receive(self, packet):
-        if packet.type == PacketType.DATA:
-            self._receiver(packet)
-        elif packet.type == PacketType.ACK:
-            self._ack_handler(packet)
+        self._rx_queue.post(self._dispatch[packet.type], packet)
 
     def _receiver(self, packet):
-        print(f"[Receiver] Received {packet}")
+        LOG.debug("[Receiver] Received %s", packet)
         if packet.is_corrupt():
-            print("[Receiver] Packet corrupted. Resending last ACK.")
-            ack = Packet(1 - self.seq_num, packet_type=PacketType.ACK)
+            LOG.debug("[Receiver] Packet corrupted. Resending last ACK.")
+            ack = Packet(self.ack_received - 1, packet_type=ACK)
         elif packet.seq == self.ack_received:
-            print(f"[Receiver] Accepted packet {packet.seq}")
-            self.buffer[self.received_count] = packet.payload
+            LOG.debug("[Receiver] Accepted packet %s", packet.seq)
+            self.buffer[packet.seq] = packet.payload
             self.received_count += 1
-            ack = Packet(packet.seq, packet_type=PacketType.ACK)
+            ack = Packet(packet.seq, packet_type=ACK)
             self.ack_received += 1
         else:
-            print("[Receiver] Duplicate or out-of-order packet received. Resending ACK.")
-            ack = Packet(packet.seq, packet_type=PacketType.ACK)
+            LOG.debug("[Receiver] Duplicate or out-of-order packet received. Resending ACK.")
+            ack = Packet(self.ack_received - 1, packet_type=ACK)
 
         self.channel.transmit(ack, self.receive)
 
     def _ack_handler(self, ack):
-        print(f"[Sender] ACK received: {ack}")
+        LOG.debug("[Sender] ACK received: %s", ack)
         if ack.is_corrupt():
-            print("[Sender] ACK is corrupt. Ignoring...")
+            LOG.debug("[Sender] ACK is corrupt. Ignoring...")
             return
 
-        if ack.seq >= self.seq_num - self.window_size and ack.seq < self.seq_num:
-            self._stop_timer(ack.seq)
-            print(f"[Sender] ACK verified for seq {ack.seq}. Moving on.")
-            self.sent_count += 1
-            if self.sent_count < self.total_packets:
-                self.send()
+        # Cumulative ACK: everything up to and including ack.seq has been delivered.
+        if 0 <= ack.seq - self.base < self.seq_num - self.base:
+            sent_at = self.sent_at.pop(ack.seq, None)
+            if sent_at is not None:
+                self.rtt.sample(time.monotonic_ns() - sent_at)
+            for seq in range(self.base, ack.seq):
+                self.sent_at.pop(seq, None)
+            self.retries = 0
+            LOG.debug("[Sender] ACK verified for seq %s. Moving on.", ack.seq)
+            self.base = ack.seq + 1
+            if self.base < self.seq_num:
+                self._start_timer()
+            else:
+                self._stop_timer()
+            self.send()
 
     def start(self):
         self.running = True
-        self.send()
+        self._rx_queue.start()
+        self._rx_queue.post(self.send)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
 
     def get_data(self):
-        return [self.buffer[i] for i in sorted(self.buffer)]
+        return self.buffer[:self.received_count]
 
 # Selective Repeat Protocol
 class SelectiveRepeatRDT:
     def __init__(self, channel, total=TOTAL_PACKETS, window_size=WINDOW_SIZE, timeout=TIMEOUT_DURATION):
+        if window_size <= 0 or window_size & (window_size - 1):
+            raise ValueError(f"window_size must be a power of two, got {window_size}")
         self.channel = channel
         self.total_packets = total
         self.window_size = window_size
-        self.timeout = timeout
+        self.base = 0
         self.seq_num = 0
         self.ack_received = 0
         self.timer = {}
-        self.buffer = {}
-        self.pending_packets = {}
-        self.sent_count = 0
+        self.buffer = [None] * total
+        # In-flight packets in a ring indexed by seq & mask; a slot is cleared once its ACK arrives
+        self._mask = window_size - 1
+        self._slots = [None] * window_size
+        self.retries = {}
         self.received_count = 0
+        self.sent_at = {}
+        self.rtt = RttEstimator(timeout)
+        self._rx_queue = RxQueue(type(self).__name__)
+        self._done = threading.Event()
+        self._dispatch = (self._receiver, self._ack_handler)  # indexed by packet type
         self.running = False
 
     def _start_timer(self, seq_num):
-        self.timer[seq_num] = threading.Timer(self.timeout, self._on_timeout, [seq_num])
-        self.timer[seq_num].start()
+        self.timer[seq_num] = wheel.schedule(time.monotonic_ns() + self.rtt.rto(self.retries.get(seq_num, 0)), self._rx_queue.post, (self._on_timeout, seq_num))
 
     def _stop_timer(self, seq_num):
         if seq_num in self.timer:
-            self.timer[seq_num].cancel()
-            del self.timer[seq_num]
+            wheel.cancel(self.timer.pop(seq_num))
+
+    def _pending_packet(self, seq_num):
+        packet = self._slots[seq_num & self._mask]
+        if packet is None or packet.seq != seq_num:
+            return None
+        return packet
 
     def _on_timeout(self, seq_num):
-        print(f"[Sender] TIMEOUT for seq {seq_num}. Retransmitting packet...")
-        self.channel.transmit(self.pending_packets[seq_num], self.receive)
+        packet = self._pending_packet(seq_num)
+        if packet is None:
+            return
+        LOG.debug("[Sender] TIMEOUT for seq %s. Retransmitting packet...", seq_num)
+        self.retries[seq_num] = self.retries.get(seq_num, 0) + 1
+        self.sent_at.pop(seq_num, None)  # Karn: never sample RTT from a retransmitted packet
         self._start_timer(seq_num)
+        # Fresh copy: the channel may have corrupted the checksum of the original in flight.
+        self.channel.transmit(Packet(seq_num, packet.payload), self.receive)
 
     def send(self):
-        if self.sent_count >= self.total_packets:
-            print("[Sender] All packets sent.")
+        if self.base >= self.total_packets:
+            LOG.debug("[Sender] All packets sent.")
             self.running = False
+            self._done.set()
+            self._rx_queue.stop()
             return
 
-        for i in range(self.window_size):
-            if self.sent_count + i < self.total_packets:
-                packet = Packet(self.seq_num + i, f"DATA_{self.sent_count + i}")
-                self.pending_packets[self.seq_num + i] = packet
-                print(f"[Sender] Sending {packet}")
-                self.channel.transmit(packet, self.receive)
-                self._start_timer(self.seq_num + i)
-
-        self.seq_num += self.window_size
-
+        end = min(self.base + self.window_size, self.total_packets)
+        packets = [Packet(seq, f"DATA_{seq}") for seq in range(self.seq_num, end)]
+        if not packets:
+            return
+        for packet in packets:
+            self._slots[packet.seq & self._mask] = packet
+        self.seq_num = end
+        for packet in packets:
+            self.sent_at[packet.seq] = time.monotonic_ns()
+            LOG.debug("[Sender] Sending %s", packet)
+            self._start_timer(packet.seq)
+        self.channel.transmit_many(packets, self.receive)
+
+    # Channel delivery callback: may run on any thread, so just hand the packet to the event queue
     def receive(self, packet):
-        if packet.type == PacketType.DATA:
-            self._receiver(packet)
-        elif packet.type == PacketType.ACK:
-            self._ack_handler(packet)
+        self._rx_queue.post(self._dispatch[packet.type], packet)
 
     def _receiver(self, packet):
-        print(f"[Receiver] Received {packet}")
+        LOG.debug("[Receiver] Received %s", packet)
         if packet.is_corrupt():
-            print("[Receiver] Packet corrupted. Resending last ACK.")
-            ack = Packet(1 - self.seq_num, packet_type=PacketType.ACK)
-        elif packet.seq == self.ack_received:
-            print(f"[Receiver] Accepted packet {packet.seq}")
-            self.buffer[self.received_count] = packet.payload
-            self.received_count += 1
-            ack = Packet(packet.seq, packet_type=PacketType.ACK)
-            self.ack_received += 1
+            LOG.debug("[Receiver] Packet corrupted. Ignoring...")
+            return
+        if 0 <= packet.seq - self.ack_received < self.window_size:
+            if self.buffer[packet.seq] is None:
+                LOG.debug("[Receiver] Accepted packet %s", packet.seq)
+                self.buffer[packet.seq] = packet.payload
+                self.received_count += 1
+            if packet.seq != self.ack_received:
+                LOG.debug("[Receiver] Out-of-order packet buffered. Waiting for missing packet...")
+            while self.ack_received < self.total_packets and self.buffer[self.ack_received] is not None:
+                self.ack_received += 1
+        elif packet.seq < self.ack_received:
+            LOG.debug("[Receiver] Duplicate packet received. Resending ACK.")
         else:
-            print("[Receiver] Out-of-order packet received. Waiting for missing packet...")
-            ack = Packet(packet.seq, packet_type=PacketType.ACK)
+            return
 
-        self.channel.transmit(ack, self.receive)
+        self.channel.transmit(Packet(packet.seq, packet_type=ACK), self.receive)
 
     def _ack_handler(self, ack):
-        print(f"[Sender] ACK received: {ack}")
+        LOG.debug("[Sender] ACK received: %s", ack)
         if ack.is_corrupt():
-            print("[Sender] ACK is corrupt. Ignoring...")
+            LOG.debug("[Sender] ACK is corrupt. Ignoring...")
             return
 
-        if ack.seq in self.pending_packets:
+        if self._pending_packet(ack.seq) is not None:
             self._stop_timer(ack.seq)
-            print(f"[Sender] ACK verified for seq {ack.seq}. Moving on.")
-            self.sent_count += 1
-            if self.sent_count < self.total_packets:
-                self.send()
+            self._slots[ack.seq & self._mask] = None
+            sent_at = self.sent_at.pop(ack.seq, None)
+            if sent_at is not None:
+                self.rtt.sample(time.monotonic_ns() - sent_at)
+            self.retries.pop(ack.seq, None)
+            LOG.debug("[Sender] ACK verified for seq %s. Moving on.", ack.seq)
+            while self.base < self.seq_num and self._slots[self.base & self._mask] is None:
+                self.base += 1
+            self.send()
 
     def start(self):
         self.running = True
-        self.send()
+        self._rx_queue.start()
+        self._rx_queue.post(self.send)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
 
     def get_data(self):
-        return [self.buffer[i] for i in sorted(self.buffer)]
+        return self.buffer[:self.ack_received]
+
+# Workers are spawned, not forked: the parent already runs the log listener thread when the pool starts
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
+# Console Logging: records are queued by the protocol workers and written to stdout by a listener thread
+def start_console_logging(level=logging.DEBUG):
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(MP_CONTEXT.Queue(), handler)
+    attach_log_queue(listener.queue, level)
+    listener.start()
+    return listener
+
+def attach_log_queue(log_queue, level=logging.DEBUG):
+    LOG.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    LOG.setLevel(level)
+    LOG.propagate = False
+
+# Prefixes a worker's records with its protocol name so concurrent traces stay readable
+class ProtocolTagFilter(logging.Filter):
+    def __init__(self, tag):
+        super().__init__()
+        self.tag = tag
+
+    def filter(self, record):
+        record.msg = f"[{self.tag}] {record.msg}"
+        return True
 
 # Main Function to Run the Protocols
+PROTOCOLS = (
+    ("Stop-and-Wait", StopAndWaitRDT),
+    ("Go-Back-N", GoBackNRDT),
+    ("Selective Repeat", SelectiveRepeatRDT),
+)
+
+# Runs in a worker process with its own channel, timer wheel and RNG
+def run_protocol(name, protocol_cls):
+    LOG.filters[:] = [ProtocolTagFilter(name)]
+    LOG.info("Starting %s Protocol", name)
+    rdt = protocol_cls(UnreliableChannel())
+    rdt.start()
+    if not rdt.wait(SIMULATION_TIMEOUT):
+        LOG.info("%s did not finish within %s sec", name, SIMULATION_TIMEOUT)
+    return rdt.get_data()
 
 def main():
-    channel = UnreliableChannel()
-    
-    print("Starting Stop-and-Wait Protocol")
-    sw_rdt = StopAndWaitRDT(channel)
-    sw_rdt.start()
-    time.sleep(1)  # Give some time for the sender to finish
-    print(f"Stop-and-Wait received data: {sw_rdt.get_data()}")
-
-    print("\nStarting Go-Back-N Protocol")
-    gbn_rdt = GoBackNRDT(channel)
-    gbn_rdt.start()
-    time.sleep(1)  # Give some time for the sender to finish
-    print(f"Go-Back-N received data: {gbn_rdt.get_data()}")
-
-    print("\nStarting Selective Repeat Protocol")
-    sr_rdt = SelectiveRepeatRDT(channel)
-    sr_rdt.start()
-    time.sleep(1)  # Give some time for the sender to finish
-    print(f"Selective Repeat received data: {sr_rdt.get_data()}")
+    listener = start_console_logging()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=len(PROTOCOLS),
+            mp_context=MP_CONTEXT,
+            initializer=attach_log_queue,
+            initargs=(listener.queue, LOG.level),
+        ) as executor:
+            futures = [executor.submit(run_protocol, name, cls) for name, cls in PROTOCOLS]
+            for (name, _), future in zip(PROTOCOLS, futures):
+                LOG.info("%s received data: %s", name, future.result())
+    finally:
+        # Flushes the queued records even when a worker raised
+        listener.stop()
 
 
 if __name__ == "__main__":
     main()
-    
-
@@ -0,0 +1,169 @@
+import random
+import struct
+import threading
+import time
+import unittest
+import zlib
+
+from main import ACK, DATA, GoBackNRDT, Packet, RttEstimator, SelectiveRepeatRDT, StopAndWaitRDT, TimerWheel, UnreliableChannel
+
+TOTAL = 20
+RUNS = 5
+WINDOW_SIZES = (1, 2, 4, 8)
+# Default loss/corruption/delay odds, but short delays and a short initial RTO keep each run fast
+CHANNEL_ARGS = {"max_delay": 0.05}
+TIMEOUT = 0.2
+
+
+class TimerWheelTest(unittest.TestCase):
+    def test_fires_in_deadline_order(self):
+        timers = TimerWheel()
+        fired = []
+        done = threading.Event()
+        now = time.monotonic_ns()
+        # Scheduled out of order; equal deadlines keep their scheduling order.
+        timers.schedule(now + 30_000_000, fired.append, ("c",))
+        timers.schedule(now + 10_000_000, fired.append, ("a",))
+        timers.schedule(now + 20_000_000, fired.append, ("b1",))
+        timers.schedule(now + 20_000_000, fired.append, ("b2",))
+        timers.schedule(now + 40_000_000, done.set)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(fired, ["a", "b1", "b2", "c"])
+
+    def test_cancel_leaves_a_tombstone(self):
+        timers = TimerWheel()
+        fired = []
+        done = threading.Event()
+        now = time.monotonic_ns()
+        handle = timers.schedule(now + 10_000_000, fired.append, ("cancelled",))
+        timers.schedule(now + 20_000_000, done.set)
+        timers.cancel(handle)
+        self.assertTrue(done.wait(5))
+        self.assertEqual(fired, [])
+        self.assertIsNone(handle[2])
+        self.assertNotIn(handle, timers._heap)  # discarded once it reached the top of the heap
+
+
+class PacketChecksumTest(unittest.TestCase):
+    def test_checksum_covers_header_and_payload(self):
+        packet = Packet(7, "DATA_7")
+        self.assertEqual(packet.checksum, zlib.crc32(struct.pack("<iB", 7, DATA) + b"DATA_7") & 0xFF)
+        ack = Packet(-1, packet_type=ACK)
+        self.assertEqual(ack.checksum, zlib.crc32(struct.pack("<iB", -1, ACK)) & 0xFF)
+
+    def test_is_corrupt_after_channel_corrupts_checksum(self):
+        packet = Packet(3, "DATA_3")
+        self.assertFalse(packet.is_corrupt())
+        delivered = []
+        UnreliableChannel(loss=0, corruption=1, delay=0).transmit(packet, delivered.append)
+        self.assertEqual(delivered, [packet])
+        self.assertTrue(packet.is_corrupt())
+        self.assertFalse(Packet(3, "DATA_3").is_corrupt())
+
+
+class RttEstimatorTest(unittest.TestCase):
+    MS = 1_000_000
+
+    def test_initial_rto_until_first_sample(self):
+        self.assertEqual(RttEstimator(initial_rto=1.0).rto(), 1000 * self.MS)
+
+    def test_samples_follow_rfc_6298(self):
+        rtt = RttEstimator(min_rto=0.05)
+        rtt.sample(100 * self.MS)
+        self.assertEqual((rtt.srtt, rtt.rttvar), (100 * self.MS, 50 * self.MS))
+        self.assertEqual(rtt.rto(), 300 * self.MS)
+        rtt.sample(200 * self.MS)
+        self.assertEqual((rtt.srtt, rtt.rttvar), (112_500_000, 62_500_000))
+        self.assertEqual(rtt.rto(), 362_500_000)
+
+    def test_rto_is_floored(self):
+        rtt = RttEstimator(min_rto=0.05)
+        rtt.sample(1 * self.MS)
+        self.assertEqual(rtt.rto(), 50 * self.MS)
+
+    def test_backoff_doubles_after_two_retries_up_to_the_cap(self):
+        rtt = RttEstimator(initial_rto=1.0, max_rto=10.0)
+        base = rtt.rto()
+        self.assertEqual([rtt.rto(retries) for retries in range(6)], [base, base, base, 2 * base, 4 * base, 8 * base])
+        self.assertEqual(rtt.rto(6), 10_000 * self.MS)
+        self.assertEqual(rtt.rto(40), 10_000 * self.MS)
+
+
+class TransmitManyTest(unittest.TestCase):
+    def test_takes_three_draws_per_packet(self):
+        packets = [Packet(seq, f"DATA_{seq}") for seq in range(4)]
+        delivered = []
+        random.seed(1)
+        UnreliableChannel(loss=0, corruption=0, delay=0).transmit_many(packets, delivered.append)
+        after = random.random()
+        random.seed(1)
+        for _ in range(3 * len(packets)):
+            random.random()
+        self.assertEqual(after, random.random())
+        self.assertEqual(delivered, packets)
+
+    def test_matches_one_transmit_per_packet(self):
+        channel = UnreliableChannel(loss=0.3, corruption=0.3, delay=0)
+        batched, single = [], []
+        random.seed(2)
+        channel.transmit_many([Packet(seq, f"DATA_{seq}") for seq in range(16)], batched.append)
+        random.seed(2)
+        for seq in range(16):
+            channel.transmit(Packet(seq, f"DATA_{seq}"), single.append)
+        self.assertEqual([(p.seq, p.is_corrupt()) for p in batched], [(p.seq, p.is_corrupt()) for p in single])
+
+
+class WindowSizeTest(unittest.TestCase):
+    def test_rejects_non_power_of_two_windows(self):
+        for protocol_cls in (GoBackNRDT, SelectiveRepeatRDT):
+            for window_size in (0, -4, 3, 6):
+                with self.subTest(protocol=protocol_cls.__name__, window_size=window_size):
+                    with self.assertRaises(ValueError):
+                        protocol_cls(UnreliableChannel(), window_size=window_size)
+
+    def test_accepts_power_of_two_windows(self):
+        for protocol_cls in (GoBackNRDT, SelectiveRepeatRDT):
+            for window_size in (1, 2, 8):
+                with self.subTest(protocol=protocol_cls.__name__, window_size=window_size):
+                    self.assertEqual(protocol_cls(UnreliableChannel(), window_size=window_size).window_size, window_size)
+
+
+# End-to-end runs over a lossy channel; every protocol must deliver all data, in order, exactly once.
+# The channels share the global RNG across threads, so the loss pattern differs from run to run.
+class EndToEndTest(unittest.TestCase):
+    def run_concurrently(self, cases, **channel_args):
+        channel_args = {**CHANNEL_ARGS, **channel_args}
+        runs = []
+        for protocol_cls, protocol_args in cases:
+            for run in range(RUNS):
+                rdt = protocol_cls(UnreliableChannel(**channel_args), total=TOTAL, timeout=TIMEOUT, **protocol_args)
+                runs.append(({"protocol": protocol_cls.__name__, "run": run, **protocol_args}, rdt))
+        for _, rdt in runs:
+            rdt.start()
+        for params, rdt in runs:
+            with self.subTest(**params):
+                self.assertTrue(rdt.wait(120), "protocol did not finish")
+                self.assertEqual(rdt.get_data(), [f"DATA_{i}" for i in range(TOTAL)])
+
+    @staticmethod
+    def windowed(protocol_cls):
+        return [(protocol_cls, {"window_size": window_size}) for window_size in WINDOW_SIZES]
+
+    def test_stop_and_wait(self):
+        self.run_concurrently([(StopAndWaitRDT, {})])
+
+    def test_go_back_n(self):
+        self.run_concurrently(self.windowed(GoBackNRDT))
+
+    def test_selective_repeat(self):
+        self.run_concurrently(self.windowed(SelectiveRepeatRDT))
+
+    # Half of all packets delayed, so copies and ACKs arrive out of order. Loss stays at the default odds:
+    # with much more, the odd packet loses a dozen round trips in a row and backoff outlasts the wait.
+    def test_heavy_reordering(self):
+        cases = [(StopAndWaitRDT, {})] + self.windowed(GoBackNRDT) + self.windowed(SelectiveRepeatRDT)
+        self.run_concurrently(cases, delay=0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()